@@ -0,0 +1,59 @@
+"""
+Gunicorn configuration for the URL Phishing Detector
+
+Usage:
+    gunicorn -c gunicorn_conf.py server_main:app
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+wsgi_app = 'server_main:app'
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', 5000)}"
+
+# Pre-forked threaded workers; threads overlap the blocking URLhaus lookups
+workers = int(os.getenv('WEB_CONCURRENCY', 2 * (os.cpu_count() or 1) + 1))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+
+# Import the app once in the master so compiled regexes and check templates
+# are shared with workers via copy-on-write
+preload_app = True
+
+# The master downloads the URLhaus dump and writes the filter here; workers
+# reload their own copy from this file after each hourly refresh. Without
+# URLHAUS_BLOOM_PATH the file lives in a fresh 0700 directory for this run.
+_BLOOM_DIR = None
+URLHAUS_BLOOM_PATH = os.getenv('URLHAUS_BLOOM_PATH')
+if not URLHAUS_BLOOM_PATH:
+    _BLOOM_DIR = tempfile.mkdtemp(prefix='urlhaus-bloom-')
+    URLHAUS_BLOOM_PATH = os.path.join(_BLOOM_DIR, 'urlhaus_bloom.bin')
+
+# Workers only trust filter files the master wrote after it started
+MASTER_STARTED_NS = time.time_ns()
+
+
+def when_ready(server):
+    """
+    Build and refresh the URLhaus bloom filter in a master background thread.
+    
+    Startup does not wait for the dump: workers serve immediately and query
+    the API for every URL until they pick up the first filter file. A slow
+    or stalled abuse.ch therefore costs lookup latency, never availability.
+    """
+    import server_main
+    server_main.start_urlhaus_bloom_refresh(URLHAUS_BLOOM_PATH)
+
+
+def post_fork(server, worker):
+    """Pick up refreshed filters written by the master."""
+    import server_main
+    server_main.start_urlhaus_bloom_reload(URLHAUS_BLOOM_PATH, MASTER_STARTED_NS)
+
+
+def on_exit(server):
+    """Remove the per-run filter directory."""
+    if _BLOOM_DIR:
+        shutil.rmtree(_BLOOM_DIR, ignore_errors=True)
@@ -4,23 +4,84 @@ Main Flask application for URL analysis
 """
 
 from flask import Flask, render_template, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
 from dotenv import load_dotenv
 import os
+import re
+import sys
+import stat
+import tempfile
 import logging
+import threading
+import time
+from functools import lru_cache
+from types import MappingProxyType
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 import requests
+from requests.adapters import HTTPAdapter
+from cachetools import TTLCache
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to stdlib json
+    orjson = None
+
+try:
+    from pybloom_live import BloomFilter
+except ImportError:  # pragma: no cover - every lookup goes to the API
+    BloomFilter = None
 
 # Load environment variables
 load_dotenv()
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes responses with orjson."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        """Serialize obj with orjson, deferring to json for unsupported options."""
+        indent = kwargs.get('indent')
+        if kwargs.keys() - {'indent', 'separators'} or indent not in (None, 2):
+            return super().dumps(obj, **kwargs)
+
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode()
+        except TypeError:
+            # e.g. integers beyond 64 bits, which the stdlib encoder accepts
+            return super().dumps(obj, **kwargs)
+
+
+def _json_default(obj):
+    """Serialize read-only check templates, then anything Flask supports."""
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    return DefaultJSONProvider.default(obj)
+
+
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+# Same output with or without orjson: insertion key order, raw UTF-8
+app.json.sort_keys = False
+app.json.ensure_ascii = False
+app.json.default = _json_default
 
 # Configuration
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-key-change-in-production')
 app.config['JSON_SORT_KEYS'] = False
+app.config['MAX_CONTENT_LENGTH'] = 1024 * 1024
 
 # Setup logging
 logging.basicConfig(
@@ -29,8 +90,133 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Longest URL accepted for analysis; also keeps cache entries bounded
+MAX_URL_LENGTH = 2048
+
+# Result caches for repeated submissions of the same URL
+ANALYSIS_CACHE_SIZE = 10000
+THREAT_CACHE_SIZE = 10000
+THREAT_CACHE_TTL = 300  # seconds
+
+_threat_cache = TTLCache(maxsize=THREAT_CACHE_SIZE, ttl=THREAT_CACHE_TTL)
+_threat_cache_lock = threading.Lock()
+
+# Pooled HTTP session so URLhaus lookups reuse TCP/TLS connections
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=32))
+
+# Local membership filter over the full URLhaus dump (online and offline
+# listings); None until first load. URLs it rules out are reported clean
+# without calling the API.
+URLHAUS_BLOOM_REFRESH = 3600  # seconds
+URLHAUS_BLOOM_POLL = 60  # seconds between checks for a rewritten filter file
+URLHAUS_BLOOM_ERROR_RATE = 0.001
+_urlhaus_bloom = None
+
+# Largest number of URLs accepted by /api/analyze_batch
+MAX_BATCH_SIZE = 100
+
+# Worker threads for URLhaus lookups. Single-URL requests get their own pool
+# so a large uncached batch cannot queue ahead of them.
+_lookup_pool = ThreadPoolExecutor(max_workers=32)
+_batch_lookup_pool = ThreadPoolExecutor(max_workers=16)
+
+# Last (second, ISO string) pair returned by _timestamp
+_timestamp_cache = (0, '')
+
+# Precompiled patterns used by the analysis checks
+_URL_RE = re.compile(r'^(https?)://([^/?#\s]+)([^?#\s]*)(?:\?([^#\s]*))?(?:#\S*)?\Z', re.IGNORECASE)
+_SPECIAL_RE = re.compile(r'[^\w.-]')
+
+# Check statuses and verdicts shared by every response
+STATUS_PASS = sys.intern('pass')
+STATUS_FAIL = sys.intern('fail')
+STATUS_WARN = sys.intern('warn')
+STATUS_SKIPPED = sys.intern('skipped')
+VERDICT_SAFE = sys.intern('safe')
+VERDICT_RISKY = sys.intern('risky')
+VERDICT_UNSAFE = sys.intern('unsafe')
+
+# Verdict for each safety score 0-100: unsafe < 50 <= risky < 75 <= safe
+_VERDICTS = (VERDICT_UNSAFE, VERDICT_RISKY, VERDICT_SAFE)
+_VERDICT_INDEX = (0,) * 50 + (1,) * 25 + (2,) * 26
+
+# Common phishing keywords scanned for in the full URL
+SUSPICIOUS_KEYWORDS = ('verify', 'confirm', 'update', 'login', 'urgent', 'click', 'secure', 'validate')
+
+
+def _check(name: str, status: str, description: str) -> MappingProxyType:
+    """Build a read-only check result entry."""
+    return MappingProxyType({'name': name, 'status': status, 'description': description})
+
+
+# Local checks in the order analyze_url runs them
+CHECK_ORDER = ('ssl', 'subdomain', 'ip', 'domain_length', 'special', 'keywords', 'url_length')
+CHECK_NAMES = ('SSL/TLS Encryption', 'Subdomain Count', 'IP Address Domain', 'Domain Length',
+               'Special Characters', 'Suspicious Keywords', 'URL Length')
+
+# Check results keyed by (check_id, outcome), built once and shared by
+# every analysis instead of allocating fresh dicts per request
+_CHECKS = {
+    ('ssl', 'pass'): _check('SSL/TLS Encryption', STATUS_PASS, 'URL uses secure HTTPS protocol'),
+    ('ssl', 'fail'): _check('SSL/TLS Encryption', STATUS_FAIL, 'URL uses unencrypted HTTP protocol'),
+    ('subdomain', 'warn'): _check('Subdomain Count', STATUS_WARN, 'Multiple subdomains may indicate suspicious hosting'),
+    ('subdomain', 'pass'): _check('Subdomain Count', STATUS_PASS, 'Normal subdomain structure'),
+    ('ip', 'fail'): _check('IP Address Domain', STATUS_FAIL, 'Direct IP addresses are often used in phishing'),
+    ('ip', 'pass'): _check('IP Address Domain', STATUS_PASS, 'Uses standard domain name'),
+    ('domain_length', 'short'): _check('Domain Length', STATUS_WARN, 'Very short domain names are uncommon'),
+    ('domain_length', 'long'): _check('Domain Length', STATUS_WARN, 'Very long domain names may be suspicious'),
+    ('domain_length', 'pass'): _check('Domain Length', STATUS_PASS, 'Domain length appears normal'),
+    ('special', 'fail'): _check('Special Characters', STATUS_FAIL, 'Domain contains suspicious special characters'),
+    ('special', 'pass'): _check('Special Characters', STATUS_PASS, 'No suspicious characters in domain'),
+    ('keywords', 0): _check('Suspicious Keywords', STATUS_PASS, 'No common phishing keywords detected'),
+    ('keywords', 1): _check('Suspicious Keywords', STATUS_WARN, 'Found 1 common phishing keyword'),
+    ('url_length', 'warn'): _check('URL Length', STATUS_WARN, 'Very long URLs may contain hidden parameters'),
+    ('url_length', 'pass'): _check('URL Length', STATUS_PASS, 'URL length is reasonable'),
+}
+for _n in range(2, len(SUSPICIOUS_KEYWORDS) + 1):
+    _CHECKS[('keywords', _n)] = _check(
+        'Suspicious Keywords', STATUS_WARN, f'Found {_n} common phishing keywords'
+    )
+
+for _check_id, _name in zip(CHECK_ORDER, CHECK_NAMES):
+    _CHECKS[(_check_id, 'skipped')] = _check(
+        _name, STATUS_SKIPPED, 'Skipped because the URL is already rated unsafe'
+    )
+
+_THREAT_CLEAN_CHECK = _check(
+    'Global Threat Database', STATUS_PASS, '✓ URL verified clean in global malicious database'
+)
+
 # ==================== URL Analysis Logic ====================
 
+@lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def _split_url(url_string: str):
+    """
+    Split an http(s) URL into (scheme, netloc, path, query).
+    
+    Cached so validating and then parsing the same URL only scans it once.
+    
+    Args:
+        url_string: URL to split
+        
+    Returns:
+        Tuple of components, or None if url_string is not an http(s) URL
+    """
+    match = _URL_RE.match(url_string)
+    if match is None:
+        return None
+    scheme, netloc, path, query = match.groups()
+    return scheme.lower(), netloc, path, query or ''
+
+
+def _split(url_string: str):
+    """Split url_string, only caching URLs up to MAX_URL_LENGTH."""
+    if len(url_string) > MAX_URL_LENGTH:
+        return _split_url.__wrapped__(url_string)
+    return _split_url(url_string)
+
+
 def is_valid_url(url_string: str) -> bool:
     """
     Validate URL format.
@@ -41,12 +227,28 @@ def is_valid_url(url_string: str) -> bool:
     Returns:
         True if valid URL format, False otherwise
     """
-    try:
-        from urllib.parse import urlparse
-        result = urlparse(url_string if url_string.startswith('http') else f'https://{url_string}')
-        return all([result.scheme, result.netloc])
-    except:
+    candidate = url_string if url_string.startswith('http') else f'https://{url_string}'
+    if len(candidate) > MAX_URL_LENGTH:
         return False
+    return _split(candidate) is not None
+
+
+def _is_ipv4(hostname: str) -> bool:
+    """
+    Check whether hostname is a dotted-quad IPv4 address.
+    
+    Args:
+        hostname: Hostname to check
+        
+    Returns:
+        True if hostname is four 1-3 digit octets in 0-255, False otherwise
+    """
+    if not hostname or not hostname[0].isdigit():
+        return False
+    parts = hostname.split('.')
+    return len(parts) == 4 and all(
+        p.isascii() and p.isdigit() and len(p) <= 3 and int(p) < 256 for p in parts
+    )
 
 
 def normalize_url(url: str) -> str:
@@ -74,7 +276,23 @@ def parse_url(url_string: str) -> dict:
     Returns:
         Dictionary with URL components
     """
-    from urllib.parse import urlparse
+    parts = _split(url_string)
+    if parts is not None:
+        scheme, netloc, path, query = parts
+        host = netloc.rpartition('@')[2]
+        if host.startswith('['):
+            host = host[1:].partition(']')[0]
+        else:
+            host = host.partition(':')[0]
+        return {
+            'full': url_string,
+            'hostname': host.lower(),
+            'protocol': scheme,
+            'pathname': path,
+            'search': query
+        }
+
+    # Fall back to the general parser for non-http(s) URLs
     url = urlparse(url_string)
     return {
         'full': url.geturl(),
@@ -85,151 +303,118 @@ def parse_url(url_string: str) -> dict:
     }
 
 
-def analyze_url(url_string: str) -> dict:
+def analyze_url(url_string: str, fail_fast: bool = False) -> dict:
     """
     Perform 7-layer security analysis on URL.
     
+    Results are cached per URL. Each call returns its own result dict and
+    checks list, so callers may adjust scores and add or reorder checks; the
+    check entries themselves are shared read-only templates.
+    
     Args:
         url_string: URL to analyze
+        fail_fast: Stop once the verdict can only be 'unsafe' and mark the
+            remaining checks as skipped
         
     Returns:
         Analysis results with verdict and risk score
     """
+    if len(url_string) > MAX_URL_LENGTH:
+        result = _analyze_url.__wrapped__(url_string, fail_fast)
+    else:
+        result = _analyze_url(url_string, fail_fast)
+    return {**result, 'checks': list(result['checks'])}
+
+
+@lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def _analyze_url(url_string: str, fail_fast: bool = False) -> dict:
+    """Uncached analysis backing analyze_url. Do not mutate the result."""
     parsed = parse_url(url_string)
-    checks = []
+    results = []
     risk_score = 0
 
     # Check 1: SSL/TLS Encryption
     if parsed['protocol'] == 'https':
-        checks.append({
-            'name': 'SSL/TLS Encryption',
-            'status': 'pass',
-            'description': 'URL uses secure HTTPS protocol'
-        })
+        results.append(('ssl', 'pass'))
     elif parsed['protocol'] == 'http':
-        checks.append({
-            'name': 'SSL/TLS Encryption',
-            'status': 'fail',
-            'description': 'URL uses unencrypted HTTP protocol'
-        })
+        results.append(('ssl', 'fail'))
         risk_score += 15
 
     # Check 2: Subdomain Count
     hostname = parsed['hostname']
-    domain_parts = hostname.split('.')
+    subdomain_parts = hostname.count('.') + 1
     
-    if len(domain_parts) > 3:
-        checks.append({
-            'name': 'Subdomain Count',
-            'status': 'warn',
-            'description': 'Multiple subdomains may indicate suspicious hosting'
-        })
+    if subdomain_parts > 3:
+        results.append(('subdomain', 'warn'))
         risk_score += 8
     else:
-        checks.append({
-            'name': 'Subdomain Count',
-            'status': 'pass',
-            'description': 'Normal subdomain structure'
-        })
+        results.append(('subdomain', 'pass'))
 
     # Check 3: IP Address Detection
-    import re
-    ip_regex = r'^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$'
-    if re.match(ip_regex, hostname):
-        checks.append({
-            'name': 'IP Address Domain',
-            'status': 'fail',
-            'description': 'Direct IP addresses are often used in phishing'
-        })
+    if _is_ipv4(hostname):
+        results.append(('ip', 'fail'))
         risk_score += 20
     else:
-        checks.append({
-            'name': 'IP Address Domain',
-            'status': 'pass',
-            'description': 'Uses standard domain name'
-        })
+        results.append(('ip', 'pass'))
 
     # Check 4: Domain Length
-    if hostname.length < 4:
-        checks.append({
-            'name': 'Domain Length',
-            'status': 'warn',
-            'description': 'Very short domain names are uncommon'
-        })
+    hostname_length = len(hostname)
+    if hostname_length < 4:
+        results.append(('domain_length', 'short'))
         risk_score += 5
-    elif len(hostname) > 50:
-        checks.append({
-            'name': 'Domain Length',
-            'status': 'warn',
-            'description': 'Very long domain names may be suspicious'
-        })
+    elif hostname_length > 50:
+        results.append(('domain_length', 'long'))
         risk_score += 5
     else:
-        checks.append({
-            'name': 'Domain Length',
-            'status': 'pass',
-            'description': 'Domain length appears normal'
-        })
+        results.append(('domain_length', 'pass'))
 
     # Check 5: Special Characters
-    if re.search(r'[^\w.-]', hostname):
-        checks.append({
-            'name': 'Special Characters',
-            'status': 'fail',
-            'description': 'Domain contains suspicious special characters'
-        })
+    if _SPECIAL_RE.search(hostname):
+        results.append(('special', 'fail'))
         risk_score += 15
     else:
-        checks.append({
-            'name': 'Special Characters',
-            'status': 'pass',
-            'description': 'No suspicious characters in domain'
-        })
+        results.append(('special', 'pass'))
+
+    # Risk can first exceed 50 (forcing 'unsafe') after this check
+    if fail_fast and risk_score > 50:
+        return _finish_analysis(results, risk_score)
 
     # Check 6: Suspicious Keywords
-    suspicious_keywords = ['verify', 'confirm', 'update', 'login', 'urgent', 'click', 'secure', 'validate']
+    # str containment runs CPython's C fastsearch per keyword, which beats
+    # a Python-level automaton walk for a handful of short keywords
     url_lower = url_string.lower()
-    found_keywords = [kw for kw in suspicious_keywords if kw in url_lower]
+    found_keywords = [kw for kw in SUSPICIOUS_KEYWORDS if kw in url_lower]
     
-    if len(found_keywords) >= 2:
-        checks.append({
-            'name': 'Suspicious Keywords',
-            'status': 'warn',
-            'description': f'Found {len(found_keywords)} common phishing keywords'
-        })
-        risk_score += len(found_keywords) * 3
-    elif len(found_keywords) > 0:
-        checks.append({
-            'name': 'Suspicious Keywords',
-            'status': 'warn',
-            'description': f'Found {len(found_keywords)} common phishing keyword'
-        })
+    keyword_count = len(found_keywords)
+    results.append(('keywords', keyword_count))
+    if keyword_count >= 2:
+        risk_score += keyword_count * 3
+    elif keyword_count > 0:
         risk_score += 5
-    else:
-        checks.append({
-            'name': 'Suspicious Keywords',
-            'status': 'pass',
-            'description': 'No common phishing keywords detected'
-        })
+
+    if fail_fast and risk_score > 50:
+        return _finish_analysis(results, risk_score)
 
     # Check 7: URL Length
     if len(parsed['full']) > 100:
-        checks.append({
-            'name': 'URL Length',
-            'status': 'warn',
-            'description': 'Very long URLs may contain hidden parameters'
-        })
+        results.append(('url_length', 'warn'))
         risk_score += 8
     else:
-        checks.append({
-            'name': 'URL Length',
-            'status': 'pass',
-            'description': 'URL length is reasonable'
-        })
+        results.append(('url_length', 'pass'))
+
+    return _finish_analysis(results, risk_score)
+
+
+def _finish_analysis(results: list, risk_score: int) -> dict:
+    """Assemble analysis output, marking checks after the last result as skipped."""
+    # Shared read-only templates
+    checks = [_CHECKS[key] for key in results]
+    last_check = CHECK_ORDER.index(results[-1][0])
+    checks.extend(_CHECKS[(check_id, 'skipped')] for check_id in CHECK_ORDER[last_check + 1:])
 
     # Calculate safety score
     safety_score = max(0, 100 - risk_score)
-    verdict = 'safe' if safety_score >= 75 else 'risky' if safety_score >= 50 else 'unsafe'
+    verdict = _VERDICTS[_VERDICT_INDEX[safety_score]]
 
     return {
         'safety_score': safety_score,
@@ -249,9 +434,50 @@ def check_global_database(url: str) -> dict:
     Returns:
         Dictionary with threat status
     """
+    result = _local_threat_check(url)
+    if result is not None:
+        return result
+
+    result = _query_urlhaus(url)
+    _remember_threat_check(url, result)
+    return dict(result)
+
+
+def _local_threat_check(url: str):
+    """
+    Answer a global database check from the verdict cache or bloom filter.
+    
+    Args:
+        url: URL to check
+        
+    Returns:
+        Dictionary with threat status, or None if the API must be queried
+    """
+    with _threat_cache_lock:
+        cached = _threat_cache.get(url)
+    if cached is not None:
+        return dict(cached)
+
+    bloom = _urlhaus_bloom
+    if bloom is not None and url not in bloom:
+        result = {'is_phishing': False}
+        _remember_threat_check(url, result)
+        return dict(result)
+    return None
+
+
+def _remember_threat_check(url: str, result: dict) -> None:
+    """Cache a verdict; API errors and over-long URLs are not remembered."""
+    if not result.get('api_error') and len(url) <= MAX_URL_LENGTH:
+        with _threat_cache_lock:
+            _threat_cache[url] = result
+
+
+def _query_urlhaus(url: str) -> dict:
+    """Query the URLhaus API for url, bypassing the verdict cache."""
     try:
         api_url = os.getenv('URLHAUS_API_URL', 'https://urlhaus-api.abuse.ch/v1/url/')
-        response = requests.post(api_url, data={'url': url}, timeout=5)
+        response = _session.post(api_url, data={'url': url}, timeout=5)
         data = response.json()
         
         if data.get('query_status') == 'ok' and data.get('result') != 'not_found':
@@ -266,6 +492,178 @@ def check_global_database(url: str) -> dict:
         return {'is_phishing': False, 'api_error': True}
 
 
+def load_urlhaus_bloom(path: str = None) -> bool:
+    """
+    Rebuild the local URLhaus bloom filter from the full URLhaus URL dump.
+    
+    The full dump includes offline listings; the online-only dump would let
+    the filter report known-bad offline URLs as clean. The download uses its
+    own short-lived session so no dump connection lingers in the shared pool.
+    
+    Args:
+        path: Optional file to also write the filter to for other processes
+        
+    Returns:
+        True if the filter was replaced, False otherwise
+    """
+    global _urlhaus_bloom
+    if BloomFilter is None:
+        return False
+    try:
+        dump_url = os.getenv('URLHAUS_DUMP_URL', 'https://urlhaus.abuse.ch/downloads/text/')
+        with requests.Session() as dump_session:
+            response = dump_session.get(dump_url, timeout=60)
+        response.raise_for_status()
+        urls = [line.strip() for line in response.text.splitlines()
+                if line.strip() and not line.startswith('#')]
+
+        bloom = BloomFilter(capacity=max(len(urls), 1000) * 2, error_rate=URLHAUS_BLOOM_ERROR_RATE)
+        for listed_url in urls:
+            bloom.add(listed_url)
+
+        # Write via a private, uniquely named temp file so readers never see
+        # a partial filter and no pre-existing name or symlink is followed
+        if path:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.urlhaus-bloom-')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    bloom.tofile(f)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+        _urlhaus_bloom = bloom
+        logger.info(f"Loaded URLhaus bloom filter with {len(urls)} URLs")
+        return True
+    except Exception as e:
+        logger.error(f"URLhaus dump error: {str(e)}")
+        return False
+
+
+def read_urlhaus_bloom(path: str) -> bool:
+    """
+    Replace the local URLhaus bloom filter with one written by load_urlhaus_bloom.
+    
+    Args:
+        path: Filter file to read
+        
+    Returns:
+        True if the filter was replaced, False otherwise
+    """
+    global _urlhaus_bloom
+    if BloomFilter is None:
+        return False
+    try:
+        with open(path, 'rb') as f:
+            _urlhaus_bloom = BloomFilter.fromfile(f)
+        logger.info(f"Reloaded URLhaus bloom filter from {path}")
+        return True
+    except Exception as e:
+        logger.error(f"URLhaus bloom file error: {str(e)}")
+        return False
+
+
+def urlhaus_bloom_enabled() -> bool:
+    """Whether the local URLhaus bloom filter is available and switched on."""
+    return BloomFilter is not None and os.getenv('URLHAUS_BLOOM_ENABLED', 'True') == 'True'
+
+
+def start_urlhaus_bloom_refresh(path: str = None) -> None:
+    """
+    Download the URLhaus bloom filter periodically in a background thread.
+    
+    Run this in a single process. If a filter is already loaded, the first
+    refresh waits a full interval.
+    
+    Args:
+        path: Optional file each refreshed filter is written to
+    """
+    if not urlhaus_bloom_enabled():
+        return
+
+    def refresh():
+        if _urlhaus_bloom is not None:
+            time.sleep(URLHAUS_BLOOM_REFRESH)
+        while True:
+            load_urlhaus_bloom(path)
+            time.sleep(URLHAUS_BLOOM_REFRESH)
+
+    threading.Thread(target=refresh, name='urlhaus-bloom', daemon=True).start()
+
+
+def start_urlhaus_bloom_reload(path: str, not_before_ns: int) -> None:
+    """
+    Reload the URLhaus bloom filter whenever the refreshing process rewrites path.
+    
+    Only regular files owned by this user and modified at or after
+    not_before_ns are accepted, so a stale or planted file is never trusted.
+    Each reload gives this process its own in-memory copy of the filter.
+    
+    Args:
+        path: Filter file written by start_urlhaus_bloom_refresh
+        not_before_ns: Start time of the refreshing process, in time.time_ns()
+    """
+    if not urlhaus_bloom_enabled():
+        return
+
+    def mtime():
+        try:
+            info = os.lstat(path)
+        except OSError:
+            return None
+        if not stat.S_ISREG(info.st_mode) or info.st_uid != os.getuid():
+            return None
+        if info.st_mtime_ns < not_before_ns:
+            return None
+        return info.st_mtime_ns
+
+    def reload():
+        seen = mtime() if _urlhaus_bloom is not None else None
+        while True:
+            current = mtime()
+            if current is not None and current != seen and read_urlhaus_bloom(path):
+                seen = current
+            time.sleep(URLHAUS_BLOOM_POLL)
+
+    threading.Thread(target=reload, name='urlhaus-bloom-reload', daemon=True).start()
+
+
+def _timestamp() -> str:
+    """Current local time in ISO format, reformatted at most once per second."""
+    global _timestamp_cache
+    now = int(time.time())
+    cached_second, formatted = _timestamp_cache
+    if now != cached_second:
+        formatted = datetime.fromtimestamp(now).isoformat()
+        _timestamp_cache = (now, formatted)
+    return formatted
+
+
+def apply_threat_check(analysis: dict, threat_check: dict) -> dict:
+    """
+    Merge a global database verdict into local analysis results.
+    
+    Args:
+        analysis: Results from analyze_url, updated in place
+        threat_check: Results from check_global_database
+        
+    Returns:
+        The updated analysis
+    """
+    if threat_check.get('is_phishing'):
+        analysis['risk_score'] += 50
+        analysis['safety_score'] = max(0, 100 - analysis['risk_score'])
+        analysis['verdict'] = VERDICT_UNSAFE
+        analysis['checks'].insert(0, _check(
+            'Global Threat Database', STATUS_FAIL,
+            f"⚠️ URL detected in abuse.ch malicious database ({threat_check.get('threat')})"
+        ))
+    elif not threat_check.get('api_error'):
+        analysis['checks'].insert(0, _THREAT_CLEAN_CHECK)
+    return analysis
+
+
 # ==================== Flask Routes ====================
 
 @app.route('/', methods=['GET'])
@@ -284,6 +682,9 @@ def api_analyze():
             "url": "https://example.com"
         }
     
+    Query parameters:
+        strict: Pass 0 to skip remaining checks once a URL is rated unsafe
+    
     Returns:
         JSON with analysis results
     """
@@ -308,27 +709,20 @@ def api_analyze():
         normalized_url = normalize_url(url)
         logger.info(f"Analyzing URL: {normalized_url}")
 
+        # Answer from cache or bloom filter inline; otherwise query the API
+        # in the background while analyzing locally
+        threat_check = _local_threat_check(normalized_url)
+        threat_future = None
+        if threat_check is None:
+            threat_future = _lookup_pool.submit(check_global_database, normalized_url)
+
         # Perform local analysis
-        analysis = analyze_url(normalized_url)
-
-        # Check global database
-        threat_check = check_global_database(normalized_url)
-
-        if threat_check.get('is_phishing'):
-            analysis['risk_score'] += 50
-            analysis['safety_score'] = max(0, 100 - analysis['risk_score'])
-            analysis['verdict'] = 'unsafe'
-            analysis['checks'].insert(0, {
-                'name': 'Global Threat Database',
-                'status': 'fail',
-                'description': f"⚠️ URL detected in abuse.ch malicious database ({threat_check.get('threat')})"
-            })
-        elif not threat_check.get('api_error'):
-            analysis['checks'].insert(0, {
-                'name': 'Global Threat Database',
-                'status': 'pass',
-                'description': '✓ URL verified clean in global malicious database'
-            })
+        analysis = analyze_url(normalized_url, fail_fast=request.args.get('strict') == '0')
+
+        if threat_future is not None:
+            threat_check = threat_future.result()
+
+        apply_threat_check(analysis, threat_check)
 
         return jsonify({
             'status': 'ok',
@@ -336,9 +730,11 @@ def api_analyze():
             'safety_score': analysis['safety_score'],
             'risk_score': analysis['risk_score'],
             'checks': analysis['checks'],
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _timestamp()
         })
 
+    except RequestEntityTooLarge:
+        raise
     except Exception as e:
         logger.error(f"Error analyzing URL: {str(e)}")
         return jsonify({
@@ -347,13 +743,97 @@ def api_analyze():
         }), 500
 
 
+@app.route('/api/analyze_batch', methods=['POST'])
+def api_analyze_batch():
+    """
+    API endpoint to analyze several URLs in one request.
+    
+    POST body:
+        {
+            "urls": ["https://example.com", "example.org"]
+        }
+    
+    Query parameters:
+        strict: Pass 0 to skip remaining checks once a URL is rated unsafe
+    
+    Returns:
+        JSON with one result per submitted URL, in order
+    """
+    try:
+        data = request.get_json(silent=True)
+        urls = data.get('urls') if isinstance(data, dict) else None
+
+        # Validate input
+        if not isinstance(urls, list) or not urls:
+            return jsonify({
+                'status': 'error',
+                'error': 'Please provide a list of URLs'
+            }), 400
+
+        if len(urls) > MAX_BATCH_SIZE:
+            return jsonify({
+                'status': 'error',
+                'error': f'At most {MAX_BATCH_SIZE} URLs per batch'
+            }), 400
+
+        # Normalize and validate each entry
+        entries = []
+        for raw in urls:
+            url = raw.strip() if isinstance(raw, str) else ''
+            if not url:
+                entries.append((raw, None, 'Please enter a URL'))
+            elif not is_valid_url(url):
+                entries.append((raw, None, 'Invalid URL format'))
+            else:
+                entries.append((raw, normalize_url(url), None))
+
+        fail_fast = request.args.get('strict') == '0'
+
+        # Look up each distinct URL once, concurrently
+        unique_urls = list(dict.fromkeys(n for _, n, _ in entries if n))
+        logger.info(f"Analyzing batch of {len(unique_urls)} URLs")
+        threats = {u: _local_threat_check(u) for u in unique_urls}
+        pending = [u for u, threat in threats.items() if threat is None]
+        threats.update(zip(pending, _batch_lookup_pool.map(check_global_database, pending)))
+
+        results = []
+        for raw, normalized_url, error in entries:
+            if error:
+                results.append({'url': raw, 'status': 'error', 'error': error})
+                continue
+            analysis = apply_threat_check(analyze_url(normalized_url, fail_fast), threats[normalized_url])
+            results.append({
+                'url': raw,
+                'status': 'ok',
+                'verdict': analysis['verdict'],
+                'safety_score': analysis['safety_score'],
+                'risk_score': analysis['risk_score'],
+                'checks': analysis['checks']
+            })
+
+        return jsonify({
+            'status': 'ok',
+            'results': results,
+            'timestamp': _timestamp()
+        })
+
+    except RequestEntityTooLarge:
+        raise
+    except Exception as e:
+        logger.error(f"Error analyzing batch: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'error': f'Error during analysis: {str(e)}'
+        }), 500
+
+
 @app.route('/api/health', methods=['GET'])
 def api_health():
     """Health check endpoint."""
     return jsonify({
         'status': 'ok',
         'version': '1.0.0',
-        'timestamp': datetime.now().isoformat()
+        'timestamp': _timestamp()
     })
 
 
@@ -368,7 +848,7 @@ def api_stats():
             'local_analysis': True,
             'global_database': True,
             'history_tracking': True,
-            'batch_processing': False
+            'batch_processing': True
         }
     })
 
@@ -381,6 +861,12 @@ def not_found(error):
     return jsonify({'status': 'error', 'error': 'Endpoint not found'}), 404
 
 
+@app.errorhandler(413)
+def request_too_large(error):
+    """Handle oversized request bodies."""
+    return jsonify({'status': 'error', 'error': 'Request body too large'}), 413
+
+
 @app.errorhandler(500)
 def server_error(error):
     """Handle 500 errors."""
@@ -396,4 +882,6 @@ if __name__ == '__main__':
     debug = os.getenv('FLASK_DEBUG', 'True') == 'True'
     
     logger.info(f"Starting phishing detector on {host}:{port}")
-    app.run(host=host, port=port, debug=debug)
+    start_urlhaus_bloom_refresh()
+    # Serve requests on separate threads so URLhaus lookups can overlap
+    app.run(host=host, port=port, debug=debug, threaded=True)
@@ -3,7 +3,32 @@ Unit tests for URL analyzer
 """
 
 import pytest
-from server import is_valid_url, normalize_url, parse_url, analyze_url
+import server_main
+from server_main import is_valid_url, normalize_url, parse_url, analyze_url
+
+
+@pytest.fixture
+def urlhaus_calls(monkeypatch):
+    """Stub the URLhaus API; URLs ending in /bad are reported as malware."""
+    calls = []
+
+    def fake_query(url):
+        calls.append(url)
+        if url.endswith('/bad'):
+            return {'is_phishing': True, 'threat': 'malware_download', 'last_analysis': 'Unknown'}
+        return {'is_phishing': False}
+
+    monkeypatch.setattr(server_main, '_query_urlhaus', fake_query)
+    monkeypatch.setattr(server_main, '_urlhaus_bloom', None)
+    server_main._threat_cache.clear()
+    yield calls
+    server_main._threat_cache.clear()
+
+
+@pytest.fixture
+def client(urlhaus_calls):
+    """Flask test client with URLhaus stubbed out."""
+    return server_main.app.test_client()
 
 
 class TestURLValidation:
@@ -28,6 +53,10 @@ class TestURLValidation:
     def test_empty_url(self):
         """Test validation of empty URL."""
         assert is_valid_url("") == False
+    
+    def test_overlong_url(self):
+        """Test validation rejects URLs beyond the length limit."""
+        assert is_valid_url("https://example.com/" + "a" * 3000) == False
 
 
 class TestURLNormalization:
@@ -81,8 +110,10 @@ class TestURLAnalysis:
     def test_analyze_unsafe_http_url(self):
         """Test analysis of unsafe HTTP URL."""
         result = analyze_url("http://example.com")
-        assert result['verdict'] in ['risky', 'unsafe']
-        assert result['risk_score'] > 0
+        ssl_check = [check for check in result['checks']
+                     if check['name'] == 'SSL/TLS Encryption']
+        assert ssl_check[0]['status'] == 'fail'
+        assert result['risk_score'] == 15
     
     def test_analyze_phishing_keywords(self):
         """Test analysis detects phishing keywords."""
@@ -92,6 +123,13 @@ class TestURLAnalysis:
                      if 'keyword' in check['name'].lower()]
         assert len(suspicious) > 0
     
+    def test_analyze_counts_distinct_keywords(self):
+        """Test repeated keywords are only counted once."""
+        result = analyze_url("https://verify-login.com/verify/login")
+        keyword_check = [check for check in result['checks']
+                         if check['name'] == 'Suspicious Keywords']
+        assert keyword_check[0]['description'] == 'Found 2 common phishing keywords'
+    
     def test_analyze_ip_address(self):
         """Test analysis detects IP addresses."""
         result = analyze_url("https://192.168.1.1")
@@ -100,6 +138,13 @@ class TestURLAnalysis:
                    if 'IP' in check['name']]
         assert len(ip_check) > 0
     
+    def test_analyze_short_domain(self):
+        """Test analysis flags very short domains."""
+        result = analyze_url("https://ab")
+        length_check = [check for check in result['checks']
+                        if check['name'] == 'Domain Length']
+        assert length_check[0]['status'] == 'warn'
+    
     def test_analyze_long_url(self):
         """Test analysis detects long URLs."""
         long_url = "https://example.com/" + "a" * 150
@@ -107,6 +152,21 @@ class TestURLAnalysis:
         # Should detect long URL
         assert result['risk_score'] > 0
     
+    def test_analysis_results_are_independent(self):
+        """Test adjusting one result does not leak into later analyses."""
+        first = analyze_url("https://google.com")
+        first['risk_score'] += 50
+        first['checks'].insert(0, {'name': 'Extra', 'status': 'fail', 'description': ''})
+        result = analyze_url("https://google.com")
+        assert result['risk_score'] == 0
+        assert len(result['checks']) == 7
+    
+    def test_check_entries_are_read_only(self):
+        """Test shared check templates cannot be mutated."""
+        result = analyze_url("https://google.com")
+        with pytest.raises(TypeError):
+            result['checks'][0]['status'] = 'changed'
+    
     def test_safety_score_calculation(self):
         """Test safety score is calculated correctly."""
         result = analyze_url("https://google.com")
@@ -126,6 +186,117 @@ class TestVerdictDetermination:
         """Test unsafe verdict for low safety score."""
         result = analyze_url("http://192.168.1.1/verify-account-urgent-confirm-login-click-here-validate-secure")
         assert result['verdict'] in ['unsafe', 'risky']
+    
+    def test_fail_fast_skips_remaining_checks(self):
+        """Test fail-fast analysis stops once the verdict is unsafe."""
+        url = "http://192.168.1.1/verify-account-urgent-confirm-login-click-here-validate-secure"
+        result = analyze_url(url, fail_fast=True)
+        assert result['verdict'] == 'unsafe'
+        assert len(result['checks']) == 7
+        assert result['checks'][-1]['status'] == 'skipped'
+        assert analyze_url(url)['verdict'] == 'unsafe'
+
+
+
+class TestBatchAnalysis:
+    """Test the batch analysis endpoint."""
+    
+    def test_rejects_non_object_body(self, client):
+        """Test a JSON body that is not an object is rejected."""
+        response = client.post('/api/analyze_batch', json=['google.com'])
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'Please provide a list of URLs'
+    
+    def test_rejects_missing_or_empty_urls(self, client):
+        """Test empty or non-list urls are rejected."""
+        for body in ({}, {'urls': []}, {'urls': 'google.com'}):
+            response = client.post('/api/analyze_batch', json=body)
+            assert response.status_code == 400
+    
+    def test_rejects_oversized_batch(self, client):
+        """Test batches beyond MAX_BATCH_SIZE are rejected."""
+        urls = ['google.com'] * (server_main.MAX_BATCH_SIZE + 1)
+        response = client.post('/api/analyze_batch', json={'urls': urls})
+        assert response.status_code == 400
+    
+    def test_non_string_entries_echoed_as_errors(self, client):
+        """Test non-string entries get per-entry errors with their value echoed."""
+        urls = [1, None, 10 ** 30]
+        response = client.post('/api/analyze_batch', json={'urls': urls})
+        assert response.status_code == 200
+        results = response.get_json()['results']
+        assert [r['url'] for r in results] == urls
+        assert all(r['status'] == 'error' for r in results)
+    
+    def test_duplicates_looked_up_once(self, client, urlhaus_calls):
+        """Test URLs that normalize to the same value hit URLhaus once."""
+        urls = ['google.com', 'google.com', 'https://google.com']
+        response = client.post('/api/analyze_batch', json={'urls': urls})
+        assert len(response.get_json()['results']) == 3
+        assert urlhaus_calls == ['https://google.com']
+    
+    def test_results_in_input_order(self, client):
+        """Test results follow the submitted order, including errors."""
+        urls = ['example.org', '', 'http://example.com/bad', 'not a url']
+        results = client.post('/api/analyze_batch', json={'urls': urls}).get_json()['results']
+        assert [r['url'] for r in results] == urls
+        assert [r['status'] for r in results] == ['ok', 'error', 'ok', 'error']
+        assert results[2]['verdict'] == 'unsafe'
+        assert results[2]['checks'][0]['name'] == 'Global Threat Database'
+
+
+
+class TestGlobalDatabase:
+    """Test URLhaus lookups, caching and the local bloom filter."""
+    
+    def test_filtered_out_url_skips_api(self, monkeypatch, urlhaus_calls):
+        """Test URLs ruled out by the filter are clean without an API call."""
+        monkeypatch.setattr(server_main, '_urlhaus_bloom', {'https://listed.example/'})
+        result = server_main.check_global_database('https://google.com')
+        assert result == {'is_phishing': False}
+        assert urlhaus_calls == []
+    
+    def test_possible_hit_queries_api(self, monkeypatch, urlhaus_calls):
+        """Test URLs the filter may contain are still checked with the API."""
+        monkeypatch.setattr(server_main, '_urlhaus_bloom', {'https://listed.example/bad'})
+        result = server_main.check_global_database('https://listed.example/bad')
+        assert result['is_phishing'] is True
+        assert urlhaus_calls == ['https://listed.example/bad']
+    
+    def test_api_errors_not_cached(self, monkeypatch):
+        """Test failed lookups are retried rather than remembered."""
+        calls = []
+
+        def failing_query(url):
+            calls.append(url)
+            return {'is_phishing': False, 'api_error': True}
+
+        monkeypatch.setattr(server_main, '_query_urlhaus', failing_query)
+        monkeypatch.setattr(server_main, '_urlhaus_bloom', None)
+        server_main._threat_cache.clear()
+        server_main.check_global_database('https://retry.example/')
+        server_main.check_global_database('https://retry.example/')
+        assert len(calls) == 2
+    
+    def test_bloom_file_round_trip(self, monkeypatch, tmp_path, urlhaus_calls):
+        """Test a filter written by load_urlhaus_bloom is read back intact."""
+        pytest.importorskip('pybloom_live')
+
+        class FakeResponse:
+            text = '# URLhaus dump\nhttp://bad.example/x\nhttps://evil.example/login\n'
+
+            def raise_for_status(self):
+                pass
+
+        monkeypatch.setattr(server_main.requests.Session, 'get',
+                            lambda self, url, timeout: FakeResponse())
+        path = str(tmp_path / 'bloom.bin')
+        assert server_main.load_urlhaus_bloom(path)
+
+        monkeypatch.setattr(server_main, '_urlhaus_bloom', None)
+        assert server_main.read_urlhaus_bloom(path)
+        assert 'https://evil.example/login' in server_main._urlhaus_bloom
+        assert 'https://google.com' not in server_main._urlhaus_bloom
 
 
 if __name__ == '__main__':